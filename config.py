@@ -1,17 +1,33 @@
 """
-Simple Configuration - Just load environment variables
+Simple Configuration - Load environment variables exactly once
 """
 import os
+from dataclasses import dataclass
 from dotenv import load_dotenv
 
-# Load .env file
+# Load .env file once at import, then snapshot the environment so later
+# access is plain attribute access instead of repeated os.environ lookups
 load_dotenv()
+_env = dict(os.environ)
 
-# Get environment variables (with defaults)
-GOOGLE_SHEET_URL = os.getenv("GOOGLE_SHEET_URL", "")
-TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN", "")
-TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID", "")
-LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
 
-# That's it! Keep it simple.
-print(f"✅ Config loaded - Log level: {LOG_LEVEL}")
\ No newline at end of file
+@dataclass(frozen=True, slots=True)
+class _Config:
+    GOOGLE_SHEET_URL: str
+    TELEGRAM_BOT_TOKEN: str
+    TELEGRAM_CHAT_ID: str
+    LOG_LEVEL: str
+
+
+CFG = _Config(
+    GOOGLE_SHEET_URL=_env.get("GOOGLE_SHEET_URL", ""),
+    TELEGRAM_BOT_TOKEN=_env.get("TELEGRAM_BOT_TOKEN", ""),
+    TELEGRAM_CHAT_ID=_env.get("TELEGRAM_CHAT_ID", ""),
+    LOG_LEVEL=_env.get("LOG_LEVEL", "INFO"),
+)
+
+# Module-level aliases so existing `config.X` access keeps working
+GOOGLE_SHEET_URL = CFG.GOOGLE_SHEET_URL
+TELEGRAM_BOT_TOKEN = CFG.TELEGRAM_BOT_TOKEN
+TELEGRAM_CHAT_ID = CFG.TELEGRAM_CHAT_ID
+LOG_LEVEL = CFG.LOG_LEVEL
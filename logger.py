@@ -2,13 +2,111 @@
 Windows-Friendly Logger for Algo Trading System
 Handles Unicode issues on Windows console
 """
+import atexit
 import logging
 import logging.handlers
 import os
+import queue
+import re
 from datetime import datetime
 from pathlib import Path
 import sys
 
+# Emoji -> text replacements, compiled once into a single regex so the
+# fallback path does one scan instead of one str.replace per emoji
+_EMOJI_MAP = {
+    '🚀': '[START]',
+    '📊': '[DATA]',
+    '📈': '[UP]',
+    '📉': '[DOWN]',
+    '🤖': '[ML]',
+    '💰': '[MONEY]',
+    '✅': '[OK]',
+    '❌': '[ERROR]',
+    '⚠️': '[WARN]',
+    '🏆': '[WIN]',
+    '📱': '[MSG]',
+    '🔍': '[SEARCH]',
+    '₹': 'Rs'
+}
+_EMOJI_RE = re.compile('|'.join(map(re.escape, _EMOJI_MAP)))
+
+
+class BufferedFileHandler(logging.FileHandler):
+    """FileHandler that writes through a large (64KB) buffer
+
+    The buffer alone isn't enough: StreamHandler.emit() calls flush()
+    after every record, which would push each line to disk immediately.
+    flush() is therefore a no-op here, and the buffer drains when it
+    fills, on rollover, and on close() (the io layer flushes when the
+    stream is closed). Only safe because these handlers live behind the
+    QueueListener, whose shutdown path closes them.
+    """
+
+    def _open(self):
+        return open(self.baseFilename, self.mode, buffering=65536,
+                    encoding=self.encoding, errors='replace')
+
+    def flush(self):
+        # No-op on purpose - see class docstring. close() still drains
+        # the buffer via the stream's own close().
+        pass
+
+
+class BufferedRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """RotatingFileHandler with the same large write buffer and no-op
+    flush(); doRollover() closes the old stream, which drains the buffer
+    before the file is renamed"""
+
+    def _open(self):
+        return open(self.baseFilename, self.mode, buffering=65536,
+                    encoding=self.encoding, errors='replace')
+
+    def flush(self):
+        # No-op on purpose - see BufferedFileHandler
+        pass
+
+
+class FastRotatingFileHandler(BufferedRotatingFileHandler):
+    """Rotating handler that counts bytes written instead of stat()ing
+
+    The stock RotatingFileHandler calls os.stat on every record inside
+    shouldRollover. Tracking an in-process byte counter (seeded from the
+    file size when the file is opened) avoids that syscall per record.
+    The count uses character length, which slightly undercounts multi-byte
+    UTF-8 messages - close enough for a 10MB rollover threshold.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._bytes_written = 0
+        self._pending_len = 0
+        super().__init__(*args, **kwargs)
+
+    def _open(self):
+        stream = super()._open()
+        try:
+            self._bytes_written = os.path.getsize(self.baseFilename)
+        except OSError:
+            self._bytes_written = 0
+        return stream
+
+    def shouldRollover(self, record):
+        if self.maxBytes <= 0:
+            return 0
+        if self.stream is None:  # delay=True and nothing logged yet
+            self.stream = self._open()
+        self._pending_len = len(self.format(record)) + 1
+        return 1 if self._bytes_written + self._pending_len >= self.maxBytes else 0
+
+    def doRollover(self):
+        super().doRollover()
+        self._bytes_written = 0
+
+    def emit(self, record):
+        super().emit(record)
+        self._bytes_written += self._pending_len
+
+
 class TradingLogger:
     """Windows-friendly logger for the trading system"""
     
@@ -40,33 +138,58 @@ class TradingLogger:
         )
         
         # File handler with UTF-8 encoding (for emojis in files)
-        file_handler = logging.handlers.RotatingFileHandler(
+        file_handler = FastRotatingFileHandler(
             self.log_dir / f"trading_system_{datetime.now().strftime('%Y%m%d')}.log",
             maxBytes=10*1024*1024,  # 10MB
             backupCount=5,
-            encoding='utf-8'  # Important for Windows
+            encoding='utf-8',  # Important for Windows
+            delay=True  # Don't open the file until something is logged
         )
         file_handler.setLevel(logging.DEBUG)
         file_handler.setFormatter(detailed_formatter)
         
-        # Console handler with error handling for Windows
+        # Console handler with error handling for Windows - reconfigure
+        # stdout to UTF-8 so the UnicodeEncodeError fallback rarely fires
+        if hasattr(sys.stdout, 'reconfigure'):
+            sys.stdout.reconfigure(encoding='utf-8', errors='replace')
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setLevel(self.log_level)
         console_handler.setFormatter(simple_formatter)
         
         # Error file handler with UTF-8 encoding
-        error_handler = logging.FileHandler(
+        error_handler = BufferedFileHandler(
             self.log_dir / f"errors_{datetime.now().strftime('%Y%m%d')}.log",
-            encoding='utf-8'
+            encoding='utf-8',
+            delay=True  # Don't create the file until an error happens
         )
         error_handler.setLevel(logging.ERROR)
         error_handler.setFormatter(detailed_formatter)
-        
-        # Add handlers
-        self.logger.addHandler(file_handler)
-        self.logger.addHandler(console_handler)
-        self.logger.addHandler(error_handler)
-    
+
+        # Run the real handlers in a background thread so logging calls
+        # just enqueue the record instead of blocking on file/console writes
+        self._queue = queue.Queue(-1)
+        self._handlers = [file_handler, console_handler, error_handler]
+        self._listener = logging.handlers.QueueListener(
+            self._queue, *self._handlers,
+            respect_handler_level=True
+        )
+        self._listener.start()
+        atexit.register(self._stop_listener)
+
+        self.logger.addHandler(logging.handlers.QueueHandler(self._queue))
+
+    def _stop_listener(self):
+        """Flush and stop the background logging thread (safe to call twice)"""
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+            for handler in self._handlers:
+                # flush() covers the console handler; close() is what
+                # actually drains the buffered file handlers, since
+                # their flush() is deliberately a no-op
+                handler.flush()
+                handler.close()
+
     def get_logger(self):
         """Get the configured logger instance"""
         return self.logger
@@ -75,27 +198,9 @@ class TradingLogger:
     def _safe_message(self, message):
         """Convert emojis to safe characters for Windows console"""
         if isinstance(message, str):
-            # Replace common emojis with text equivalents for console
-            replacements = {
-                '🚀': '[START]',
-                '📊': '[DATA]',
-                '📈': '[UP]',
-                '📉': '[DOWN]',
-                '🤖': '[ML]',
-                '💰': '[MONEY]',
-                '✅': '[OK]',
-                '❌': '[ERROR]',
-                '⚠️': '[WARN]',
-                '🏆': '[WIN]',
-                '📱': '[MSG]',
-                '🔍': '[SEARCH]',
-                '₹': 'Rs'
-            }
-            
-            safe_message = message
-            for emoji, replacement in replacements.items():
-                safe_message = safe_message.replace(emoji, replacement)
-            return safe_message
+            # Single regex pass over the message instead of one
+            # str.replace scan per emoji
+            return _EMOJI_RE.sub(lambda m: _EMOJI_MAP[m.group(0)], message)
         return message
     
     def info(self, message):
@@ -1,28 +1,20 @@
 """
 MAIN ALGO TRADING SYSTEM - Windows Console Friendly
 """
-import yfinance as yf
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-import sys
-import os
-
-# Add all our modules to path
-sys.path.append('src/data')
-sys.path.append('src/strategy') 
-sys.path.append('src/ml')
-sys.path.append('src/automation')
 
 # Import the simple additions
 from logger import TradingLogger
 import config
 
-# Import existing modules (unchanged)
-from data_fetcher import DataFetcher
-from indicators import TechnicalIndicators
-from backtester import Backtester
-from model import StockPredictor
-from sheets_manager import SheetsManager
-from telegram_bot import TelegramAlert
+# src is a proper package now - no sys.path.append hacks needed
+from src.data.data_fetcher import DataFetcher, StockArrays
+from src.data.indicators import TechnicalIndicators
+from src.strategy.backtester import Backtester
+from src.ml.model import StockPredictor
+from src.automation.sheets_manager import SheetsManager
+from src.automation.telegram_bot import TelegramAlert
 
 class AlgoTradingSystem:
     def __init__(self):
@@ -54,54 +46,95 @@ class AlgoTradingSystem:
             self.telegram = None
             self.logger.info("Telegram alerts disabled")
     
+    def _analyze_one(self, stock, data):
+        """Analyze a single stock - runs inside a worker thread"""
+        self.logger.info(f"Analyzing {stock}...")
+
+        # Extract the OHLCV columns into contiguous arrays once for all consumers
+        arrays = StockArrays.from_dataframe(data)
+
+        # Run backtest
+        signals = self.backtester.generate_signals(arrays, stock)
+        trades, portfolio_history, final_portfolio = self.backtester.simulate_trading(signals, stock)
+
+        # Calculate return
+        return_pct = ((final_portfolio['total_value'] - self.backtester.initial_capital) / self.backtester.initial_capital * 100)
+
+        # ML prediction
+        features = self.predictor.prepare_features(arrays, stock)
+        ml_results = self.predictor.train_models(features)
+
+        # Log results with the stock name so interleaved worker output stays readable
+        self.logger.info(f"  {stock} Return: {return_pct:+.1f}%")
+        self.logger.info(f"  {stock} ML Accuracy: {ml_results['decision_tree_accuracy']:.1%}")
+        self.logger.info(f"  {stock} Trades: {len(trades)}")
+
+        return stock, {
+            'return': return_pct,
+            'trades': len(trades),
+            'ml_accuracy': ml_results['decision_tree_accuracy'] * 100,
+            'latest_price': float(arrays.close[-1]),
+            'trades_data': trades
+        }
+
     def run_complete_analysis(self):
         """Run complete trading analysis - Windows friendly logging"""
         self.logger.info("RUNNING COMPLETE MARKET ANALYSIS")
         self.logger.info("="*50)
-        
+
+        # Imported here so startup doesn't pay the yfinance import tax
+        import yfinance as yf
+
+        # One batched download for all stocks (parallel threads) instead of
+        # one serial HTTP round-trip per stock
+        bulk = yf.download(self.stocks, period="6mo", group_by="ticker",
+                           threads=True, auto_adjust=False, progress=False)
+
+        # Analyze all stocks in parallel - downloads and BLAS-heavy model
+        # fits release the GIL, so threads overlap the per-stock work
         results = {}
-        
-        for stock in self.stocks:
-            self.logger.info(f"Analyzing {stock}...")
-            
-            # Get data
-            data = yf.download(stock, period="6mo")
-            
-            # Run backtest
-            signals = self.backtester.generate_signals(data, stock)
-            trades, portfolio_history, final_portfolio = self.backtester.simulate_trading(signals, stock)
-            
-            # Calculate return
-            return_pct = ((final_portfolio['total_value'] - self.backtester.initial_capital) / self.backtester.initial_capital * 100)
-            
-            # ML prediction
-            features = self.predictor.prepare_features(data)
-            ml_results = self.predictor.train_models(features)
-            
-            # Store results
-            results[stock] = {
-                'return': return_pct,
-                'trades': len(trades),
-                'ml_accuracy': ml_results['decision_tree_accuracy'] * 100,
-                'latest_price': data['Close'].iloc[-1].item(),
-                'trades_data': trades
-            }
-            
-            # Log results - Windows friendly
-            self.logger.info(f"  Return: {return_pct:+.1f}%")
-            self.logger.info(f"  ML Accuracy: {ml_results['decision_tree_accuracy']:.1%}")
-            self.logger.info(f"  Trades: {len(trades)}")
-        
-        return results
+        with ThreadPoolExecutor(max_workers=len(self.stocks)) as executor:
+            per_stock = executor.map(self._analyze_one, self.stocks,
+                                     [bulk[stock].dropna() for stock in self.stocks])
+            for stock, result in per_stock:
+                results[stock] = result
+
+        # Summarize once here; the sheets update and final report reuse it
+        return results, self._aggregate(results)
     
-    def update_google_sheets(self, results):
+    def _aggregate(self, results):
+        """Summarize results in one pass instead of a sum()/max() per metric"""
+        total_return = 0.0
+        total_trades = 0
+        total_accuracy = 0.0
+        best = None
+        best_return = float('-inf')
+
+        for stock, data in results.items():
+            total_return += data['return']
+            total_trades += data['trades']
+            total_accuracy += data['ml_accuracy']
+            if data['return'] > best_return:
+                best_return = data['return']
+                best = stock
+
+        n = len(results)
+        return {
+            'avg_return': total_return / n,
+            'total_trades': total_trades,
+            'avg_ml_accuracy': total_accuracy / n,
+            'best_performer': best
+        }
+
+    def update_google_sheets(self, results, summary):
         """Update Google Sheets - Windows friendly logging"""
         self.logger.info("UPDATING GOOGLE SHEETS...")
         
-        # Log all trades
+        # Log all trades, collecting alert messages as we go
+        alert_messages = []
         for stock, data in results.items():
             for trade in data['trades_data']:
-                self.sheets.log_trade({
+                trade_record = {
                     'date': trade['date'].strftime('%Y-%m-%d'),
                     'symbol': stock,
                     'action': trade['action'],
@@ -109,22 +142,19 @@ class AlgoTradingSystem:
                     'price': trade['price'],
                     'value': trade['value'],
                     'portfolio_value': trade['portfolio_value']
-                })
-        
-        # Update portfolio summary
-        avg_return = sum([data['return'] for data in results.values()]) / len(results)
-        total_trades = sum([data['trades'] for data in results.values()])
-        avg_ml_accuracy = sum([data['ml_accuracy'] for data in results.values()]) / len(results)
-        
-        self.sheets.update_portfolio({
-            'total_stocks_analyzed': len(self.stocks),
-            'average_return': f"{avg_return:.1f}%",
-            'total_trades_executed': total_trades,
-            'average_ml_accuracy': f"{avg_ml_accuracy:.1f}%",
-            'best_performer': max(results.keys(), key=lambda x: results[x]['return']),
-            'analysis_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        })
-        
+                }
+                self.sheets.log_trade(trade_record)
+                if self.telegram:
+                    alert_messages.append(self.telegram.format_trade_alert(trade_record))
+
+        # Send all buffered trades in one batched API call
+        self.sheets.flush_trades()
+
+        # One concurrent Telegram batch instead of a message-by-message loop
+        if self.telegram:
+            self.telegram.send_batch(alert_messages)
+
+        # Update portfolio summary and performance in one API call
         performance_data = []
         for stock, data in results.items():
             performance_data.append({
@@ -133,8 +163,15 @@ class AlgoTradingSystem:
                 'trades': data['trades'],
                 'win_rate': 0  # Calculate actual win rate if needed
             })
-        
-        self.sheets.update_performance(performance_data)
+
+        self.sheets.update_portfolio_and_performance({
+            'total_stocks_analyzed': len(self.stocks),
+            'average_return': f"{summary['avg_return']:.1f}%",
+            'total_trades_executed': summary['total_trades'],
+            'average_ml_accuracy': f"{summary['avg_ml_accuracy']:.1f}%",
+            'best_performer': summary['best_performer'],
+            'analysis_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        }, performance_data)
 
         self.logger.info("Google Sheets updated successfully!")
     
@@ -142,13 +179,13 @@ class AlgoTradingSystem:
         if self.telegram:
             self.telegram.send_portfolio_summary({
                 'total_value': f"Rs {self.backtester.initial_capital:,}",
-                'average_return': f"{avg_return:.1f}%",
-                'best_performer': max(results.keys(), key=lambda x: results[x]['return']),
-                'total_trades_executed': total_trades,
-                'average_ml_accuracy': f"{avg_ml_accuracy:.1f}%"
+                'average_return': f"{summary['avg_return']:.1f}%",
+                'best_performer': summary['best_performer'],
+                'total_trades_executed': summary['total_trades'],
+                'average_ml_accuracy': f"{summary['avg_ml_accuracy']:.1f}%"
             })
     
-    def show_final_report(self, results):
+    def show_final_report(self, results, summary):
         """Show final report - Windows friendly"""
         self.logger.info("\n" + "="*60)
         self.logger.info("FINAL ALGO TRADING SYSTEM REPORT")
@@ -161,11 +198,10 @@ class AlgoTradingSystem:
             self.logger.info(f"   Trades: {data['trades']}")
             self.logger.info(f"   Latest Price: Rs {data['latest_price']:.0f}")
         
-        avg_return = sum([data['return'] for data in results.values()]) / len(results)
         self.logger.info(f"\nPORTFOLIO SUMMARY:")
-        self.logger.info(f"   Average Return: {avg_return:+.1f}%")
-        self.logger.info(f"   Total Trades: {sum([data['trades'] for data in results.values()])}")
-        self.logger.info(f"   Avg ML Accuracy: {sum([data['ml_accuracy'] for data in results.values()]) / len(results):.1f}%")
+        self.logger.info(f"   Average Return: {summary['avg_return']:+.1f}%")
+        self.logger.info(f"   Total Trades: {summary['total_trades']}")
+        self.logger.info(f"   Avg ML Accuracy: {summary['avg_ml_accuracy']:.1f}%")
         
         self.logger.info(f"\nSYSTEM STATUS: ALL COMPONENTS WORKING!")
         self.logger.info("="*60)
@@ -175,6 +211,6 @@ class AlgoTradingSystem:
 if __name__ == "__main__":
     # Initialize and run
     system = AlgoTradingSystem()
-    results = system.run_complete_analysis()
-    system.update_google_sheets(results)
-    system.show_final_report(results)
\ No newline at end of file
+    results, summary = system.run_complete_analysis()
+    system.update_google_sheets(results, summary)
+    system.show_final_report(results, summary)
\ No newline at end of file
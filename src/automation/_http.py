@@ -0,0 +1,18 @@
+"""
+Shared HTTP connection pooling for the automation integrations
+
+TLS handshakes to Google/Telegram cost ~100ms each; mounting a pooled
+keep-alive adapter means that price is paid once per run, not per API call.
+"""
+import requests
+from requests.adapters import HTTPAdapter
+
+# Module-level session for any plain HTTP use
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+
+
+def mount_pooled_adapter(session):
+    """Mount the keep-alive adapter on an existing (e.g. authorized) session"""
+    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+    return session
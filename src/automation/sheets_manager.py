@@ -1,9 +1,6 @@
 """
 Google Sheets Manager - REAL Google Sheets Integration
 """
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
-import pandas as pd
 from datetime import datetime
 import os
 
@@ -11,19 +8,31 @@ class SheetsManager:
     def __init__(self, credentials_file='credentials.json', sheet_url=None):
         """Initialize Google Sheets connection"""
         print("Initializing Google Sheets Manager...")
-        
+
         # Check if credentials file exists
         if os.path.exists(credentials_file):
             try:
+                # Imported here so mock-mode runs never pay the
+                # gspread/oauth2client import cost
+                import gspread
+                from oauth2client.service_account import ServiceAccountCredentials
+
                 # Set up credentials
                 scope = ['https://spreadsheets.google.com/feeds',
                         'https://www.googleapis.com/auth/drive']
-                
+
                 credentials = ServiceAccountCredentials.from_json_keyfile_name(
                     credentials_file, scope)
                 
-                # Connect to Google Sheets
+                # Connect to Google Sheets - pool connections on the
+                # authorized session so every call reuses warm TLS sockets
+                try:
+                    from src.automation._http import mount_pooled_adapter
+                except ImportError:  # run directly from src/automation
+                    from _http import mount_pooled_adapter
+
                 self.gc = gspread.authorize(credentials)
+                mount_pooled_adapter(self.gc.session)
                 self.mock_mode = False
                 print("✅ Connected to Google Sheets!")
                 
@@ -45,6 +54,9 @@ class SheetsManager:
         # Mock data storage
         self.trade_log = []
         self.portfolio_summary = {}
+
+        # Buffer trades locally so we send one batched API call, not one per trade
+        self._trade_buffer = []
     
     def connect_to_sheet(self, sheet_url):
         """Connect to a specific Google Sheet"""
@@ -92,88 +104,122 @@ class SheetsManager:
             print(f"⚠️ Headers may already exist: {e}")
     
     def log_trade(self, trade_data):
-        """Log a trade to Google Sheets"""
+        """Buffer a trade - call flush_trades() to send everything in one API call"""
         if self.mock_mode:
             print(f"📊 MOCK TRADE: {trade_data}")
             self.trade_log.append(trade_data)
             return
-        
+
+        # Prepare row data
+        row = [
+            trade_data.get('date', ''),
+            trade_data.get('symbol', ''),
+            trade_data.get('action', ''),
+            trade_data.get('shares', 0),
+            trade_data.get('price', 0),
+            trade_data.get('value', 0),
+            trade_data.get('portfolio_value', 0)
+        ]
+
+        self._trade_buffer.append(row)
+
+    def flush_trades(self):
+        """Send all buffered trades to Google Sheets in a single batched call"""
+        if self.mock_mode or not self._trade_buffer:
+            return
+
         try:
             trade_sheet = self.sheet.worksheet("Trade Log")
-            
-            # Prepare row data
-            row = [
-                trade_data.get('date', ''),
-                trade_data.get('symbol', ''),
-                trade_data.get('action', ''),
-                trade_data.get('shares', 0),
-                trade_data.get('price', 0),
-                trade_data.get('value', 0),
-                trade_data.get('portfolio_value', 0)
-            ]
-            
-            trade_sheet.append_row(row)
-            print(f"✅ Trade logged to Google Sheets")
-            
+            trade_sheet.append_rows(self._trade_buffer, value_input_option="USER_ENTERED")
+            print(f"✅ {len(self._trade_buffer)} trades logged to Google Sheets")
+            self._trade_buffer = []
+
         except Exception as e:
-            print(f"❌ Error logging trade: {e}")
+            print(f"❌ Error logging trades: {e}")
     
+    def _portfolio_values(self, portfolio_data):
+        """Build the Portfolio Summary value grid (headers + rows + padding)"""
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        headers = ["Metric", "Value", "Last_Updated"]
+        rows = [[key.replace('_', ' ').title(), str(value), timestamp]
+                for key, value in portfolio_data.items()]
+        # A few padded blank rows wipe any stale data below the live rows
+        rows += [["", "", ""]] * 10
+        return [headers] + rows
+
+    def _performance_values(self, performance_data):
+        """Build the Performance Metrics value grid (headers + rows + padding)"""
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        headers = ["Stock", "Total_Return", "Trades", "Win_Rate", "Last_Updated"]
+        rows = [[
+            stock_data.get('stock', ''),
+            f"{stock_data.get('return', 0):.1f}%",
+            stock_data.get('trades', 0),
+            f"{stock_data.get('win_rate', 0):.1f}%",
+            timestamp
+        ] for stock_data in performance_data]
+        rows += [["", "", "", "", ""]] * 10
+        return [headers] + rows
+
+    def _batch_update(self, data):
+        """Write one or more sheet ranges in a single values_batch_update call"""
+        self.sheet.values_batch_update({
+            "value_input_option": "USER_ENTERED",
+            "data": data
+        })
+
     def update_portfolio(self, portfolio_data):
         """Update portfolio summary in Google Sheets"""
         if self.mock_mode:
             print(f"💼 MOCK PORTFOLIO: {portfolio_data}")
             self.portfolio_summary = portfolio_data
             return
-        
+
         try:
-            portfolio_sheet = self.sheet.worksheet("Portfolio Summary")
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            
-            # Clear existing data (except headers)
-            portfolio_sheet.clear()
-            headers = ["Metric", "Value", "Last_Updated"]
-            portfolio_sheet.insert_row(headers, 1)
-            
-            # Add portfolio data
-            for key, value in portfolio_data.items():
-                row = [key.replace('_', ' ').title(), str(value), timestamp]
-                portfolio_sheet.append_row(row)
-            
+            self._batch_update([
+                {"range": "Portfolio Summary!A1",
+                 "values": self._portfolio_values(portfolio_data)}
+            ])
             print(f"✅ Portfolio updated in Google Sheets")
-            
+
         except Exception as e:
             print(f"❌ Error updating portfolio: {e}")
-    
+
     def update_performance(self, performance_data):
         """Update performance metrics"""
         if self.mock_mode:
             print(f"📈 MOCK PERFORMANCE: {performance_data}")
             return
-        
+
         try:
-            performance_sheet = self.sheet.worksheet("Performance Metrics")
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            
-            # Clear existing data (except headers)
-            performance_sheet.clear()
-            headers = ["Stock", "Total_Return", "Trades", "Win_Rate", "Last_Updated"]
-            performance_sheet.insert_row(headers, 1)
-            
-            # Add performance data
-            for stock_data in performance_data:
-                row = [
-                    stock_data.get('stock', ''),
-                    f"{stock_data.get('return', 0):.1f}%",
-                    stock_data.get('trades', 0),
-                    f"{stock_data.get('win_rate', 0):.1f}%",
-                    timestamp
-                ]
-                performance_sheet.append_row(row)
-            
+            self._batch_update([
+                {"range": "Performance Metrics!A1",
+                 "values": self._performance_values(performance_data)}
+            ])
             print(f"✅ Performance metrics updated")
-            
+
         except Exception as e:
             print(f"❌ Error updating performance: {e}")
+
+    def update_portfolio_and_performance(self, portfolio_data, performance_data):
+        """Write both summary tabs in one values_batch_update API call"""
+        if self.mock_mode:
+            print(f"💼 MOCK PORTFOLIO: {portfolio_data}")
+            self.portfolio_summary = portfolio_data
+            print(f"📈 MOCK PERFORMANCE: {performance_data}")
+            return
+
+        try:
+            self._batch_update([
+                {"range": "Portfolio Summary!A1",
+                 "values": self._portfolio_values(portfolio_data)},
+                {"range": "Performance Metrics!A1",
+                 "values": self._performance_values(performance_data)}
+            ])
+            print(f"✅ Portfolio and performance updated in one call")
+
+        except Exception as e:
+            print(f"❌ Error updating portfolio/performance: {e}")
     
     def show_summary(self):
         """Show current summary"""
@@ -205,7 +251,8 @@ if __name__ == "__main__":
         'value': 28580,
         'portfolio_value': 100000
     })
-    
+    sheets.flush_trades()
+
     # Test portfolio update
     sheets.update_portfolio({
         'total_value': 99246,
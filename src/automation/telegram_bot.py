@@ -1,40 +1,82 @@
 """
 Telegram Bot Integration for Trading Alerts
 """
-import telegram
-from telegram import Bot
 import asyncio
+import threading
 
 class TelegramAlert:
     def __init__(self, bot_token, chat_id=None):
         """Initialize Telegram bot"""
+        # Imported here so modules that never send alerts don't pay the
+        # python-telegram-bot import cost
+        from telegram import Bot
+        from telegram.request import HTTPXRequest
+
         self.bot_token = bot_token
         self.chat_id = chat_id
-        self.bot = Bot(token=bot_token)
+        # Pooled transport so batched sends reuse warm TLS connections
+        self.bot = Bot(token=bot_token,
+                       request=HTTPXRequest(connection_pool_size=8,
+                                            connect_timeout=5.0))
+
+        # One persistent event loop in a background thread - asyncio.run
+        # per message would create and tear down a loop (plus the bot's
+        # connection pool) on every send
+        self._loop = asyncio.new_event_loop()
+        threading.Thread(target=self._loop.run_forever, daemon=True).start()
+
         print("📱 Telegram bot initialized!")
-    
+
+    def _run(self, coro, timeout=30):
+        """Run a coroutine on the shared loop and wait for the result"""
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        return future.result(timeout=timeout)
+
+    async def _send_all(self, messages):
+        await asyncio.gather(*[
+            self.bot.send_message(chat_id=self.chat_id, text=m)
+            for m in messages
+        ])
+
     def send_message(self, message):
         """Send message to Telegram"""
         try:
             if self.chat_id:
-                asyncio.run(self.bot.send_message(chat_id=self.chat_id, text=message))
+                self._run(self.bot.send_message(chat_id=self.chat_id, text=message))
                 print(f"✅ Telegram message sent!")
             else:
                 print(f"📱 TELEGRAM: {message}")
         except Exception as e:
             print(f"❌ Telegram error: {e}")
-    
-    def send_trade_alert(self, trade_data):
-        """Send trade alert"""
+
+    def send_batch(self, messages):
+        """Send several messages concurrently over the shared loop"""
+        if not messages:
+            return
+        try:
+            if self.chat_id:
+                self._run(self._send_all(messages), timeout=60)
+                print(f"✅ {len(messages)} Telegram messages sent!")
+            else:
+                for message in messages:
+                    print(f"📱 TELEGRAM: {message}")
+        except Exception as e:
+            print(f"❌ Telegram error: {e}")
+
+    def format_trade_alert(self, trade_data):
+        """Build the trade alert text without sending it"""
         symbol = trade_data['symbol']
         action = trade_data['action']
         price = trade_data['price']
         shares = trade_data['shares']
         value = trade_data['value']
         date = trade_data['date']
-        
-        message = f"🔔 TRADE ALERT\n📊 {symbol}\n🎯 {action} {shares} shares at ₹{price:.2f}\n💵 Total: ₹{value:,.0f}\n📅 {date}"
-        self.send_message(message)
+
+        return f"🔔 TRADE ALERT\n📊 {symbol}\n🎯 {action} {shares} shares at ₹{price:.2f}\n💵 Total: ₹{value:,.0f}\n📅 {date}"
+
+    def send_trade_alert(self, trade_data):
+        """Send trade alert"""
+        self.send_message(self.format_trade_alert(trade_data))
     
     def send_portfolio_summary(self, portfolio_data):
         """Send portfolio summary"""
@@ -1,8 +1,33 @@
 """
 Simple Data Fetcher - Step by step build
 """
-import yfinance as yf
 import pandas as pd
+import numpy as np
+from dataclasses import dataclass
+
+
+@dataclass
+class StockArrays:
+    """OHLCV columns extracted once into contiguous float64 arrays
+
+    Downstream code (indicators, backtester, ML features) works on plain
+    ndarrays, so pull each column out of the DataFrame a single time
+    instead of paying .values/.iloc dispatch in every consumer.
+    """
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    index: pd.DatetimeIndex
+
+    @classmethod
+    def from_dataframe(cls, data):
+        def col(name):
+            return np.ascontiguousarray(np.asarray(data[name], dtype=np.float64).ravel())
+        return cls(col('Open'), col('High'), col('Low'), col('Close'),
+                   col('Volume'), data.index)
+
 
 class DataFetcher:
     def __init__(self):
@@ -12,17 +37,26 @@ class DataFetcher:
     
     def fetch_one_stock(self, symbol):
         """Fetch data for one stock"""
+        # Imported here so importing this module doesn't pay the
+        # yfinance import tax - only actual fetches need it
+        import yfinance as yf
+
         print(f"Fetching data for {symbol}...")
         data = yf.download(symbol, period="1mo")
         print(f"Got {len(data)} days of data")
         return data
     
     def fetch_three_stocks(self):
-        """Fetch data for our 3 main stocks"""
+        """Fetch data for our 3 main stocks in one batched download"""
+        import yfinance as yf
+
+        print(f"\nFetching {len(self.stocks)} stocks in one batch...")
+        bulk = yf.download(self.stocks, period="6mo", group_by="ticker",
+                           threads=True, progress=False)  # 6 months for backtesting
+
         all_data = {}
         for stock in self.stocks:
-            print(f"\nFetching {stock}...")
-            data = yf.download(stock, period="6mo")  # 6 months for backtesting
+            data = bulk[stock].dropna()
             all_data[stock] = data
             print(f"✓ {stock}: {len(data)} days")
         return all_data
@@ -1,47 +1,213 @@
 """
 Technical Indicators - Step by step build
 """
+import threading
+
 import pandas as pd
 import numpy as np
+from numba import njit, types
+
+# Default scratch-buffer capacity; covers years of daily bars and grows
+# automatically for longer series
+_SCRATCH_LEN = 1024
+
+# Prices may arrive as read-only views (pandas .to_numpy()); readonly
+# input types accept both
+_RO_F8 = types.Array(types.float64, 1, 'C', readonly=True)
+
+
+# Eager signature: compiled ahead of first use (at import) instead of
+# lazily on the first call, and cached on disk - so no symbol ever pays
+# JIT warmup inside the hot path
+@njit(types.void(_RO_F8, types.int64, types.int64, types.int64,
+                 types.float64[::1], types.float64[::1], types.float64[::1]),
+      cache=True)
+def _indicators_njit(prices, rsi_period, short_window, long_window,
+                     rsi, ma_short, ma_long):
+    """RSI + both moving averages fused into one compiled pass
+
+    Wilder's recursive smoothing for RSI and sliding-window sums for the
+    moving averages share a single traversal of the price array, so each
+    price is loaded from memory once instead of once per indicator.
+    Results are written into the caller-provided output arrays, so the
+    kernel itself allocates nothing.
+    """
+    n = prices.shape[0]
+
+    short_sum = 0.0
+    long_sum = 0.0
+    avg_gain = 0.0
+    avg_loss = 0.0
+
+    for i in range(n):
+        p = prices[i]
+        rsi[i] = np.nan
+        ma_short[i] = np.nan
+        ma_long[i] = np.nan
+
+        # Sliding-window sums: add the new price, drop the one that left
+        short_sum += p
+        long_sum += p
+        if i >= short_window:
+            short_sum -= prices[i - short_window]
+        if i >= short_window - 1:
+            ma_short[i] = short_sum / short_window
+        if i >= long_window:
+            long_sum -= prices[i - long_window]
+        if i >= long_window - 1:
+            ma_long[i] = long_sum / long_window
+
+        # Wilder's RSI: seed with a simple mean of the first period's
+        # changes, then avg = (avg*(period-1) + change) / period
+        if i >= 1:
+            change = p - prices[i - 1]
+            gain = change if change > 0 else 0.0
+            loss = -change if change < 0 else 0.0
+            if i <= rsi_period:
+                avg_gain += gain
+                avg_loss += loss
+                if i == rsi_period:
+                    avg_gain /= rsi_period
+                    avg_loss /= rsi_period
+                    if avg_loss == 0.0:
+                        rsi[i] = 100.0
+                    else:
+                        rsi[i] = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+            else:
+                avg_gain = (avg_gain * (rsi_period - 1) + gain) / rsi_period
+                avg_loss = (avg_loss * (rsi_period - 1) + loss) / rsi_period
+                if avg_loss == 0.0:
+                    rsi[i] = 100.0
+                else:
+                    rsi[i] = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+
+# Cross-module indicator cache: backtester, ML features and strategy all
+# compute RSI/MAs on the same Close window, so the second and third caller
+# get a hit instead of recomputing
+_INDICATOR_CACHE = {}
+_CACHE_LIMIT = 128
+
+
+def get_cached_indicators(symbol, close, index, indicators):
+    """Return (rsi, ma20, ma50) for a symbol's window, memoized
+
+    The key hashes (symbol, series length, first/last index entry,
+    first/last close) - still O(1), no whole-array hashing. The close
+    fingerprint matters: NSE symbols share an identical trading-day
+    index, so without it two different series over the same window
+    (e.g. prepare_features called with the default symbol=None) would
+    alias to one entry. Cached arrays are shared - callers must treat
+    them as read-only.
+    """
+    n = len(close)
+    if n:
+        key = (symbol, n, index[0], index[-1], close[0], close[-1])
+    else:
+        key = (symbol, 0, None, None, None, None)
+    hit = _INDICATOR_CACHE.get(key)
+    if hit is None:
+        if len(_INDICATOR_CACHE) >= _CACHE_LIMIT:
+            _INDICATOR_CACHE.clear()
+        hit = indicators.compute_all(close)
+        _INDICATOR_CACHE[key] = hit
+    return hit
+
 
 class TechnicalIndicators:
-    def __init__(self):
-        print("TechnicalIndicators initialized!")
-    
+    def __init__(self, verbose=False):
+        """verbose turns on per-call progress prints - demo use only;
+        quiet by default so parallel sweeps don't serialize on stdout"""
+        self.verbose = verbose
+        if verbose:
+            print("TechnicalIndicators initialized!")
+        # Reusable output buffers so repeated calls across stocks don't
+        # re-allocate; thread-local because the per-stock analysis runs
+        # in worker threads sharing one instance
+        self._scratch = threading.local()
+
+    def _buffers(self, n):
+        """Per-thread scratch views of length n, grown on demand"""
+        scratch = self._scratch
+        if getattr(scratch, 'capacity', 0) < n:
+            scratch.capacity = max(n, _SCRATCH_LEN)
+            scratch.rsi = np.empty(scratch.capacity)
+            scratch.ma_short = np.empty(scratch.capacity)
+            scratch.ma_long = np.empty(scratch.capacity)
+        return scratch.rsi[:n], scratch.ma_short[:n], scratch.ma_long[:n]
+
+    def compute_all(self, prices, rsi_period=14, short_window=20, long_window=50):
+        """Compute RSI, short MA and long MA in one pass, returned as ndarrays"""
+        values = np.ascontiguousarray(np.asarray(prices, dtype=np.float64).ravel())
+        rsi, ma_short, ma_long = self._buffers(len(values))
+        _indicators_njit(values, rsi_period, short_window, long_window,
+                         rsi, ma_short, ma_long)
+        # Copy at the boundary - callers own their results, the scratch
+        # buffers get reused by the next call
+        return rsi.copy(), ma_short.copy(), ma_long.copy()
+
     def calculate_rsi(self, prices, period=14):
         """
         Calculate RSI (Relative Strength Index)
         RSI < 30 = Oversold (BUY signal)
         RSI > 70 = Overbought (SELL signal)
         """
-        print(f"Calculating RSI with {period} days period...")
-        
-        # Calculate price changes
-        delta = prices.diff()
-        
-        # Separate gains and losses
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-        
-        # Calculate RSI
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        
+        if self.verbose:
+            print(f"Calculating RSI with {period} days period...")
+
+        rsi, _, _ = self.compute_all(prices, rsi_period=period)
+
+        if isinstance(prices, (pd.Series, pd.DataFrame)):
+            return pd.Series(rsi, index=prices.index, name='RSI')
         return rsi
-    
+
+    @staticmethod
+    def _sliding_mean(values, window):
+        """Trailing mean via prefix sums: O(n) total, O(1) per step"""
+        n = len(values)
+        if n < window:
+            return np.full(n, np.nan)
+        csum = np.cumsum(np.insert(values, 0, 0.0))
+        out = np.empty(n)
+        out[:window - 1] = np.nan
+        out[window - 1:] = (csum[window:] - csum[:-window]) / window
+        return out
+
     def calculate_moving_averages(self, prices, short_window=20, long_window=50):
         """
         Calculate moving averages
         Our strategy: 20-DMA crossing above 50-DMA = Bullish signal
+
+        Returns plain ndarrays so downstream consumers skip pandas alignment.
         """
-        print(f"Calculating {short_window}-day and {long_window}-day moving averages...")
-        
-        ma_short = prices.rolling(window=short_window).mean()
-        ma_long = prices.rolling(window=long_window).mean()
-        
+        if self.verbose:
+            print(f"Calculating {short_window}-day and {long_window}-day moving averages...")
+
+        values = np.ascontiguousarray(np.asarray(prices, dtype=np.float64).ravel())
+
+        # V[t] = V[t-1] + (S[t] - S[t-w])/w, expressed as cumsum diffs -
+        # arithmetic is O(n) regardless of window size
+        ma_short = self._sliding_mean(values, short_window)
+        ma_long = self._sliding_mean(values, long_window)
+
         return ma_short, ma_long
 
 
+# Process-wide TechnicalIndicators singleton. The class keeps all its
+# mutable state in thread-local scratch buffers, so one instance can be
+# shared safely across Backtester/StockPredictor/TradingStrategy and
+# across worker threads.
+_SHARED_INDICATORS = None
+
+
+def shared_indicators():
+    """Return the module-level TechnicalIndicators, building it on first use"""
+    global _SHARED_INDICATORS
+    if _SHARED_INDICATORS is None:
+        _SHARED_INDICATORS = TechnicalIndicators()
+    return _SHARED_INDICATORS
+
+
 # Test it
 if __name__ == "__main__":
     import yfinance as yf  # Direct import for testing
@@ -52,7 +218,7 @@ if __name__ == "__main__":
     print(f"Got {len(data)} days of data")
     
     # Test indicators
-    indicators = TechnicalIndicators()
+    indicators = TechnicalIndicators(verbose=True)
     rsi = indicators.calculate_rsi(data['Close'])
     ma20, ma50 = indicators.calculate_moving_averages(data['Close'])
     
@@ -64,8 +230,8 @@ if __name__ == "__main__":
         date = rsi.index[i].strftime('%Y-%m-%d')
         price = float(data['Close'].iloc[i])
         rsi_val = float(rsi.iloc[i])
-        ma20_val = float(ma20.iloc[i])
-        ma50_val = float(ma50.iloc[i])
+        ma20_val = float(ma20[i])
+        ma50_val = float(ma50[i])
         
         # Our strategy: RSI < 30 AND MA20 > MA50
         rsi_signal = rsi_val < 30
